@@ -1,17 +1,30 @@
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import ssl
+from email.message import EmailMessage
 import time
 import os
+import random
+from collections import deque
+import re
+import json
+import html
+import html.entities
+import string
+import hashlib
+import atexit
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests 
-from requests_toolbelt import sessions
-from bs4 import BeautifulSoup 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import importlib.util
 
 # --- CONFIGURATION (PRODUCTION DEPLOYMENT) ---
 
 # 1. Email Details (Read securely from GitHub Secrets)
 SMTP_SERVER = "smtp.gmail.com"  
-SMTP_PORT = 587
+SMTP_PORT = 465  # Implicit TLS: no plaintext EHLO + STARTTLS round trip before AUTH
 SENDER_EMAIL = os.environ.get("SENDER_EMAIL")
 SENDER_PASSWORD = os.environ.get("SENDER_PASSWORD")
 RECEIVER_EMAIL = os.environ.get("RECEIVER_EMAIL") 
@@ -35,8 +48,117 @@ TARGETS = [
     }
 ]
 
+# 4. Run shape (defaults match the one-minute schedule; overridable from the workflow environment)
+NUM_CHECKS = int(os.environ.get("MONITOR_NUM_CHECKS", 6))
+SLEEP_INTERVAL = int(os.environ.get("MONITOR_SLEEP_INTERVAL", 10))
+
+# 5. Adaptive polling (seconds): poll at the floor while events are on the pages, back off by the
+#    idle factor while they are quiet, stretch further while the site is slow or failing, and
+#    jitter every interval so polls do not fall into a fixed rhythm
+MIN_POLL_INTERVAL = 5
+MAX_POLL_INTERVAL = 60
+IDLE_BACKOFF_FACTOR = 1.5
+POLL_JITTER = 0.2
+
+# 6. Concurrency (targets are independent, so they are fetched in parallel)
+MAX_CONCURRENT_CHECKS = 3
+
+# 7. Network timeouts in seconds: fail fast on a dead connect, and give up on a stalled server.
+#    READ_TIMEOUT bounds each wait for data, not the whole download, and is not tied to the
+#    poll interval (which adapts and can be overridden); an overrunning cycle simply delays the next
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 10
+
+# 8. Verbose per-fetch logging (off by default to keep the scheduled job's log output small)
+DEBUG = bool(os.environ.get("MONITOR_DEBUG"))
+
+# 9. Masquerade headers (set once on the long-lived session)
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+}
+
+# 10. Alert de-duplication: the same (term, score line) is not re-sent within the window;
+#    records older than the max age are dropped when the file is loaded
+ALERT_DEDUP_SECONDS = 900
+SEEN_EVENTS_MAX_AGE = 3600
+SEEN_EVENTS_PATH = os.environ.get("MONITOR_SEEN_PATH", "/tmp/monitor_seen_events.json")
+
+# 11. Page state (cache validators + content digests) carried over to the next scheduled run, so an
+#    unchanged page is not re-scanned on every cold start; older entries are discarded on load
+PAGE_STATE_MAX_AGE = 3600
+PAGE_STATE_PATH = os.environ.get("MONITOR_PAGE_STATE_PATH", "/tmp/monitor_page_state.json")
+
+
+# --- EMAIL ALERT FUNCTIONS ---
+
+# One authenticated SMTP session is kept open for the whole run (guarded, since checks run on worker threads)
+_smtp = None
+_smtp_lock = threading.Lock()
+
+# Certificate store loaded once per process rather than on every (re)connect
+_SSL_CONTEXT = ssl.create_default_context()
+
+
+def _get_smtp():
+    """Returns the cached SMTP session, only reconnecting (TLS + AUTH) when it has gone stale."""
+    global _smtp
+    if _smtp is not None:
+        try:
+            if _smtp.noop()[0] == 250:
+                return _smtp
+        except (smtplib.SMTPException, OSError):
+            pass
+        _drop_smtp()
+
+    print(f"SMTP: Attempting connection to send email...")
+    server = smtplib.SMTP_SSL(SMTP_SERVER, SMTP_PORT, context=_SSL_CONTEXT)
+    try:
+        server.login(SENDER_EMAIL, SENDER_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    _smtp = server
+    return _smtp
+
+
+def _drop_smtp():
+    """Discards the cached SMTP session so the next _get_smtp() reconnects."""
+    global _smtp
+    if _smtp is not None:
+        _smtp.close()
+        _smtp = None
+
+
+def _close_smtp():
+    """Ends the cached SMTP session once, at process exit."""
+    if _smtp is not None:
+        try:
+            _smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            _smtp.close()
+
+
+atexit.register(_close_smtp)
+
+
+# Alert email HTML, built once at import; only the body and the link are substituted per alert
+ALERT_HTML_TEMPLATE = string.Template("""
+<html>
+  <body>
+    <h2>🚨 LIVE SCORE ALERT: Tennis Event Detected! 🚨</h2>
+    <p style="font-size: 16px;">The automated monitoring script has found a matching event:</p>
+    <p style="white-space: pre-wrap; font-weight: bold; color: red; background-color: #f7f7f7; padding: 10px; border-radius: 5px;">${body}</p>
+    <p><strong>Action Required:</strong> Please check the website immediately for details.</p>
+    <a href="${url}" style="display: inline-block; padding: 10px 20px; color: white; background-color: #007bff; text-decoration: none; border-radius: 5px;">View Live Scores</a>
+    <hr>
+    <p style="font-size: 10px; color: #999;">This alert was generated automatically.</p>
+  </body>
+</html>
+""")
 
-# --- EMAIL ALERT FUNCTIONS (Unchanged) ---
 
 def send_email_alert(subject, body):
     if not all([SENDER_EMAIL, SENDER_PASSWORD, RECEIVER_EMAIL]):
@@ -44,31 +166,23 @@ def send_email_alert(subject, body):
         return False
 
     try:
-        msg = MIMEMultipart()
+        msg = EmailMessage()
         msg['From'] = SENDER_EMAIL
         msg['To'] = RECEIVER_EMAIL
         msg['Subject'] = subject
         
-        html_body = f"""
-        <html>
-          <body>
-            <h2>🚨 LIVE SCORE ALERT: Tennis Event Detected! 🚨</h2>
-            <p style="font-size: 16px;">The automated monitoring script has found a matching event:</p>
-            <p style="white-space: pre-wrap; font-weight: bold; color: red; background-color: #f7f7f7; padding: 10px; border-radius: 5px;">{body}</p>
-            <p><strong>Action Required:</strong> Please check the website immediately for details.</p>
-            <a href="{TARGETS[0]['url']}" style="display: inline-block; padding: 10px 20px; color: white; background-color: #007bff; text-decoration: none; border-radius: 5px;">View Live Scores</a>
-            <hr>
-            <p style="font-size: 10px; color: #999;">This alert was generated automatically.</p>
-          </body>
-        </html>
-        """
-        msg.attach(MIMEText(html_body, 'html'))
+        # Plain-text part plus the HTML alternative (escaped, since the body is scraped page text)
+        msg.set_content(body)
+        html_body = ALERT_HTML_TEMPLATE.substitute(body=html.escape(body), url=html.escape(TARGETS[0]['url']))
+        msg.add_alternative(html_body, subtype='html')
         
-        print(f"SMTP: Attempting connection to send email...")
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            server.sendmail(SENDER_EMAIL, RECEIVER_EMAIL, msg.as_string())
+        with _smtp_lock:
+            try:
+                _get_smtp().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # The cached session can still drop between the NOOP probe and the send: reconnect once
+                _drop_smtp()
+                _get_smtp().send_message(msg)
             print(f"SMTP SUCCESS: Email queued for delivery for subject: {subject}")
             return True
 
@@ -80,13 +194,71 @@ def send_email_alert(subject, body):
         return False
 
 
+# Alerts are handed to a background worker so SMTP latency never eats into a check cycle
+_mail_queue = queue.Queue()
+_mail_thread = None
+
+
+def _mail_worker():
+    """Sends queued alerts one at a time over the shared SMTP session."""
+    while True:
+        subject, body, on_done = _mail_queue.get()
+        try:
+            sent = send_email_alert(subject, body)
+            if on_done is not None:
+                on_done(sent)
+        except Exception as e:
+            print(f"ERROR: Mail worker failed to process alert: {e}")
+        finally:
+            _mail_queue.task_done()
+
+
+def queue_email_alert(subject, body, on_done=None):
+    """Queues an alert for the mail worker; `on_done(sent)` is called with the send result."""
+    global _mail_thread
+    if _mail_thread is None:
+        _mail_thread = threading.Thread(target=_mail_worker, name="mail-worker", daemon=True)
+        _mail_thread.start()
+    _mail_queue.put_nowait((subject, body, on_done))
+
+
+def flush_email_alerts():
+    """Blocks until every queued alert has been handled."""
+    _mail_queue.join()
+
+
+# Registered after _close_smtp, so it runs first at exit: pending alerts go out before the session is closed
+atexit.register(flush_email_alerts)
+
+
 # --- CORE MONITORING LOGIC (Using Proxy + BeautifulSoup) ---
 
+def _new_session():
+    """Creates a long-lived, connection-pooling session with the masquerade headers set once."""
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    
+    # Keep a keep-alive connection per concurrent worker, and absorb transient gateway errors
+    # with a short retry instead of losing the whole check. Read timeouts are not retried and
+    # Retry-After is ignored, so one slow target stays within the check interval
+    adapter = HTTPAdapter(
+        pool_connections=len(TARGETS) * 2,
+        pool_maxsize=len(TARGETS) * 2,
+        max_retries=Retry(
+            total=2, connect=1, read=0, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+            respect_retry_after_header=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 def create_proxied_session():
     """Creates a requests session configured with the proxy credentials."""
     if not all([PROXY_HOST, PROXY_USER, PROXY_PASS]):
         print("CRITICAL PROXY ERROR: Proxy credentials missing. Cannot start proxied session. Falling back to direct connection.")
-        return requests.Session() 
+        return _new_session()
 
     # Construct the authenticated proxy URL
     if PROXY_USER and PROXY_PASS:
@@ -97,7 +269,7 @@ def create_proxied_session():
     proxy_url = f"http://{proxy_auth}{PROXY_HOST}"
     
     # Create a session and set the proxy
-    session = requests.Session()
+    session = _new_session()
     session.proxies = {
         "http": proxy_url,
         "https": proxy_url,
@@ -105,42 +277,211 @@ def create_proxied_session():
     return session
 
 
+def _is_score_line_style(value):
+    """Score lines are the <div>s styled 'overflow:hidden'."""
+    return value and 'overflow:hidden' in value
+
+
+# The C-backed lxml tree builder is several times faster than the pure-Python html.parser; use it when installed
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+# bs4 is imported on first use: most cycles end at the 304, hash or needle check and never parse
+_soup_tools = None
+
+
+def _score_line_parser():
+    """
+    Returns (BeautifulSoup, strainer), importing bs4 on the first call.
+    The strainer builds only the score-line <div>s into the parse tree;
+    scripts, ads, menus and other page chrome are skipped while parsing.
+    """
+    global _soup_tools
+    if _soup_tools is None:
+        from bs4 import BeautifulSoup, SoupStrainer
+        _soup_tools = (BeautifulSoup, SoupStrainer('div', style=_is_score_line_style))
+    return _soup_tools
+
+
+# Digest of the last body scanned per URL; an unchanged page cannot yield anything new
+_last_page_hashes = {}
+
+# Conditional-GET headers built from the last response's cache validators, per URL
+_page_validators = {}
+
+_VALIDATOR_HEADERS = (('ETag', 'If-None-Match'), ('Last-Modified', 'If-Modified-Since'))
+
+
+def load_page_state(path=PAGE_STATE_PATH):
+    """Restores the validators and digests an earlier run saved for the current TARGETS, unless older than PAGE_STATE_MAX_AGE."""
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return
+
+    cutoff = time.time() - PAGE_STATE_MAX_AGE
+    for url in {target['_url'] for target in TARGETS}:
+        entry = state.get(url)
+        if not entry or entry.get('saved_at', 0) <= cutoff:
+            continue
+        if entry.get('validators'):
+            _page_validators[url] = entry['validators']
+        if entry.get('hash'):
+            _last_page_hashes[url] = bytes.fromhex(entry['hash'])
+
+
+def save_page_state(path=PAGE_STATE_PATH):
+    """Persists the current validators and digests for the next run."""
+    now = time.time()
+    validators = dict(_page_validators)
+    hashes = dict(_last_page_hashes)
+    state = {
+        url: {
+            'validators': validators.get(url, {}),
+            'hash': hashes[url].hex() if url in hashes else None,
+            'saved_at': now,
+        }
+        for url in validators.keys() | hashes.keys()
+    }
+    try:
+        with open(path, 'w') as f:
+            json.dump(state, f)
+    except OSError as e:
+        print(f"WARNING: Could not persist page state to {path}: {e}")
+
+
+def _term_needle(term):
+    """
+    Returns the longest whitespace-free fragment of a search term.
+
+    get_text(separator=' ') only joins text nodes with spaces, so this fragment
+    must appear in the raw HTML for the term to be found in a score line: verbatim,
+    or with some of its characters written as character references (e.g. &#46;).
+    """
+    return max(term.split(), key=len)
+
+
+def _prepare_target(target: dict):
+    """Precomputes everything derived from a target's config (URL, matchers) once at import instead of on every check."""
+    needles = {term: _term_needle(term) for term in target['terms']}
+    # A single alternation scans the raw HTML once for every term. The lookahead reports a match
+    # at every position, and longest-first ordering means a shorter needle found at the same
+    # position is always a substring of the reported one.
+    alternation = '|'.join(re.escape(needle) for needle in sorted(set(needles.values()), key=len, reverse=True))
+    target['_url'] = target['url'].strip()
+    target['_needles'] = needles
+    target['_needle_re'] = re.compile(f"(?=({alternation}))")
+    # The same matcher over the UTF-8 encoded needles, for scanning the raw response bytes without
+    # decoding them (the score pages are served in an ASCII-compatible encoding)
+    target['_needle_re_bytes'] = re.compile(b"(?=(" + alternation.encode() + b"))")
+    # Character references that decode to a needle character (numeric ones, plus the named entities
+    # for those characters): a page containing one can hide a term from the raw-bytes scan
+    needle_chars = set(''.join(needles.values()))
+    entity_names = sorted(name for name, value in html.entities.html5.items() if value in needle_chars)
+    target['_needle_chars'] = needle_chars
+    target['_char_ref_re_bytes'] = re.compile(
+        b"&#[0-9]+;?|&#[xX][0-9a-fA-F]+;?" + b"".join(b"|&" + re.escape(name).encode() for name in entity_names)
+    )
+
+
+for _target in TARGETS:
+    _prepare_target(_target)
+
+
 def monitor_page(session, target: dict):
     """
     Fetches the content from the stable data source URL directly and searches using BS4.
+    Returns the list of found terms (with context), or None when the page could not be fetched;
+    alerting is left to the caller.
     """
-    clean_url = target['url'].strip()
-    
-    # Masquerade headers
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Connection': 'keep-alive',
-    }
+    clean_url = target['_url']
     
     try:
-        print(f"NETWORK: Fetching {target['type']} data from {clean_url}...")
+        if DEBUG:
+            print(f"NETWORK: Fetching {target['type']} data from {clean_url}...")
+        
+        # 1. Fetch raw content (headers first, so a non-document body is never downloaded)
+        response_data = session.get(
+            clean_url, headers=_page_validators.get(clean_url), timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=True
+        )
+        if response_data.status_code == 304:
+            response_data.close()
+            print(f"DETECTION SKIPPED: {target['type']} page not modified since last check.")
+            return []
+        if not response_data.ok:
+            # Release the streamed connection now rather than when the response is garbage-collected
+            response_data.close()
+            response_data.raise_for_status()
         
-        # 1. Fetch raw content
-        response_data = session.get(clean_url, headers=headers, timeout=15)
-        response_data.raise_for_status()
+        content_type = response_data.headers.get('Content-Type', '')
+        # Media types are case-insensitive ('Text/HTML' is HTML)
+        if content_type and 'html' not in content_type.lower():
+            # An error or challenge page from the proxy/CDN, not the score page: a failed fetch, not a quiet page
+            response_data.close()
+            print(f"NETWORK ERROR: {target['type']} returned non-HTML content ({content_type}).")
+            return None
         
-        # 2. Parse the content with BeautifulSoup
-        soup_data = BeautifulSoup(response_data.text, 'html.parser')
+        # Cache validators for the next check (answered with an empty 304 while the page is unchanged);
+        # stored only once this response has been fully scanned, or a failed read would hide it
+        page_validators = {
+            request_header: response_data.headers[response_header]
+            for response_header, request_header in _VALIDATOR_HEADERS
+            if response_header in response_data.headers
+        }
+        
+        # 2. Skip all detection work when the page is byte-for-byte the same as last check
+        page_bytes = response_data.content
+        page_hash = hashlib.blake2b(page_bytes, digest_size=16).digest()
+        if _last_page_hashes.get(clean_url) == page_hash:
+            _page_validators[clean_url] = page_validators
+            print(f"DETECTION SKIPPED: {target['type']} page unchanged since last check.")
+            return []
+        
+        # 3. Fast path: one regex pass over the raw bytes finds the terms written verbatim on the page;
+        #    the page is only decoded and parsed when there is at least one (or a character
+        #    reference that could spell one)
+        found_needles = {needle.decode() for needle in set(target['_needle_re_bytes'].findall(page_bytes))}
+        candidate_terms = [
+            term for term, needle in target['_needles'].items()
+            if any(needle in found for found in found_needles)
+        ]
+        if len(candidate_terms) < len(target['terms']) and any(
+            html.unescape(ref.decode()) in target['_needle_chars']
+            for ref in set(target['_char_ref_re_bytes'].findall(page_bytes))
+        ):
+            # A needle may be written with character references (e.g. "ret&#46;"); only the parse
+            # decodes those, so check every term the slow way
+            candidate_terms = list(target['terms'])
+        if not candidate_terms:
+            _page_validators[clean_url] = page_validators
+            _last_page_hashes[clean_url] = page_hash
+            print(f"DETECTION FAILURE: No targets found in {target['type']} page.")
+            return []
+        
+        # 4. Decode the page and parse only the score lines with BeautifulSoup
+        page_html = response_data.text
+        beautiful_soup, score_line_strainer = _score_line_parser()
+        soup_data = beautiful_soup(page_html, HTML_PARSER, parse_only=score_line_strainer)
         
         found_terms = []
         
-        # 3. Structural Search (Mimicking innerText/CTRL+F)
-        for term in target['terms']:
-            
-            # Find all <div> elements with the 'overflow:hidden' style, which are the score lines
-            score_divs = soup_data.find_all('div', style=lambda value: value and 'overflow:hidden' in value)
-
-            for div in score_divs:
-                # Concatenate all text inside the div, ignoring HTML tags (the key fix!)
-                full_concatenated_text = div.get_text(separator=' ', strip=True) 
-                
+        # 5. Structural Search (Mimicking innerText/CTRL+F)
+        # Only score lines holding a needle can match, so find those text nodes first and mark
+        # every enclosing <div> with the 'overflow:hidden' style (the score lines)
+        matching_divs = set()
+        for text_node in soup_data.find_all(string=target['_needle_re']):
+            matching_divs.update(id(div) for div in text_node.find_parents('div', style=_is_score_line_style))
+        
+        # Concatenate all text inside just those divs, ignoring HTML tags (the key fix!),
+        # in page order and once for all terms
+        score_lines = [
+            div.get_text(separator=' ', strip=True)
+            for div in soup_data.find_all('div', style=_is_score_line_style)
+            if id(div) in matching_divs
+        ]
+        
+        for term in candidate_terms:
+            for full_concatenated_text in score_lines:
                 # Check if the clean, concatenated text contains the term
                 if term in full_concatenated_text:
                     found_terms.append({
@@ -148,65 +489,263 @@ def monitor_page(session, target: dict):
                         "context": full_concatenated_text # Use the clean text for context
                     })
         
+        # Only a fully scanned page may be skipped next time: a read or parse error must not hide it
+        _page_validators[clean_url] = page_validators
+        _last_page_hashes[clean_url] = page_hash
+        
         if found_terms:
             print(f"DETECTION SUCCESS: Found required term(s) in {target['type']} page.")
-            
-            email_body = ""
-            subject_terms = []
-            
-            for item in found_terms:
-                subject_terms.append(item['term'])
-                email_body += (
-                    f"--- Status Found: {item['term']} ---\n"
-                    f"Contextual Line(s) from Page:\n"
-                    f"{item['context']}\n\n"
-                )
-
-            subject = f"ALERT: {target['type']} - Status Detected: {', '.join(subject_terms)}"
-            
-            send_email_alert(subject, email_body)
-            return True
         else:
             print(f"DETECTION FAILURE: No targets found in {target['type']} page.")
-            return False
+        return found_terms
 
     except requests.exceptions.RequestException as e:
         print(f"NETWORK ERROR: Failed to fetch data source: {e}")
-        return False
+        return None
     except Exception as e:
         print(f"PROCESSING ERROR: during {target['type']} processing: {e}")
-        return False
+        return []
 
 
-def main():
+def build_cycle_alert(hits):
+    """
+    Builds a single alert (subject, body) covering every target that matched in one cycle.
+    `hits` is a list of (target, found_terms) pairs.
+    """
+    email_body = ""
+    subject_terms = []
     
-    NUM_CHECKS = 6
-    SLEEP_INTERVAL = 10 
+    for target, found_terms in hits:
+        email_body += f"===== {target['type']} =====\n\n"
+        for item in found_terms:
+            subject_terms.append(item['term'])
+            email_body += (
+                f"--- Status Found: {item['term']} ---\n"
+                f"Contextual Line(s) from Page:\n"
+                f"{item['context']}\n\n"
+            )
+
+    subject = f"ALERT: {len(subject_terms)} events across {len(hits)} pages - Status Detected: {', '.join(subject_terms)}"
+    return subject, email_body
+
+
+# --- ALERT DE-DUPLICATION ---
+
+def _event_key(target, item):
+    """Short, stable key for one detected event (page type + term + its score line)."""
+    return hashlib.blake2b(f"{target['type']}|{item['term']}|{item['context']}".encode(), digest_size=8).hexdigest()
+
+
+def load_seen_events(path=SEEN_EVENTS_PATH):
+    """Loads the {event key: last alert time} records, sweeping out any older than SEEN_EVENTS_MAX_AGE."""
+    try:
+        with open(path) as f:
+            seen = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return prune_seen_events(seen, time.time())
+
+
+def prune_seen_events(seen, now):
+    """Drops records older than SEEN_EVENTS_MAX_AGE in place, so the table stays bounded during a run."""
+    cutoff = now - SEEN_EVENTS_MAX_AGE
+    # Iterate over a snapshot: the mail worker may remove records concurrently
+    for key, alerted_at in list(seen.items()):
+        if alerted_at <= cutoff:
+            seen.pop(key, None)
+    return seen
+
+
+def save_seen_events(seen, path=SEEN_EVENTS_PATH):
+    """Persists the alert records so the next run (or a restarted one) does not repeat them."""
+    try:
+        with open(path, 'w') as f:
+            # Snapshot first: the main thread may record new events while the mail worker saves
+            json.dump(dict(seen), f)
+    except OSError as e:
+        print(f"WARNING: Could not persist alerted events to {path}: {e}")
+
+
+def is_new_event(seen, target, item, now):
+    """True unless this exact event was already alerted for this target within ALERT_DEDUP_SECONDS."""
+    return seen.get(_event_key(target, item), 0) <= now - ALERT_DEDUP_SECONDS
+
+
+def mark_events_seen(seen, hits, now):
+    """Records every event of an alert as alerted at `now`."""
+    for target, found_terms in hits:
+        for item in found_terms:
+            seen[_event_key(target, item)] = now
+
+
+def forget_events(seen, hits):
+    """
+    Removes the records of an alert that failed to send, so the next cycle retries it. The pages'
+    cached validators and hashes are dropped too, or an unchanged page would never be re-scanned.
+    """
+    for target, found_terms in hits:
+        _page_validators.pop(target['_url'], None)
+        _last_page_hashes.pop(target['_url'], None)
+        for item in found_terms:
+            seen.pop(_event_key(target, item), None)
+
+
+# Hits of alerts that failed to send, handed back by the mail worker. main() forgets them between
+# cycles, when no fetch worker is reading or writing the page state
+_failed_alerts = queue.Queue()
+
+
+def forget_failed_alerts(seen):
+    """Forgets every alert reported as failed since the last call; runs on the main thread only."""
+    forgotten = False
+    while True:
+        try:
+            hits = _failed_alerts.get_nowait()
+        except queue.Empty:
+            break
+        forget_events(seen, hits)
+        forgotten = True
+    if forgotten:
+        # A later alert may have saved these records before they were forgotten
+        save_seen_events(seen)
+
+
+def dispatch_cycle_alert(seen, hits, now):
+    """
+    Queues one alert for a cycle's hits. The events are recorded up front so later cycles do not
+    queue them again while the send is in flight; a failed send is handed back to main(), which
+    removes the records again before the next cycle.
+    """
+    prune_seen_events(seen, now)
+    mark_events_seen(seen, hits, now)
+
+    def on_done(sent):
+        if sent:
+            save_seen_events(seen)
+        else:
+            _failed_alerts.put(hits)
+
+    queue_email_alert(*build_cycle_alert(hits), on_done=on_done)
+
+
+def next_poll_interval(base_interval, recent_durations, consecutive_failures):
+    """
+    Picks the gap before the next cycle: 2x/4x the base interval when recent cycles have used more
+    than half/80% of it (the site is slow), and exponential backoff while every fetch keeps failing.
+    """
+    interval = base_interval
+    if recent_durations:
+        mean_duration = sum(recent_durations) / len(recent_durations)
+        if mean_duration > 0.8 * base_interval:
+            interval = base_interval * 4
+        elif mean_duration > 0.5 * base_interval:
+            interval = base_interval * 2
+    if consecutive_failures:
+        interval = max(interval, base_interval * 2 ** consecutive_failures)
+    return min(interval, MAX_POLL_INTERVAL)
+
+
+def main(num_checks=NUM_CHECKS, sleep_interval=SLEEP_INTERVAL):
     
-    # Create the proxied session ONCE
+    # Create the proxied session ONCE and reuse it (and its keep-alive connections) for every check
     session = create_proxied_session()
     
-    print(f"--- Starting PRODUCTION MONITORING RUN: {NUM_CHECKS} checks with a {SLEEP_INTERVAL}-second target interval. ---")
+    # One worker per target (bounded), so a cycle takes max(target latencies) instead of their sum
+    executor = ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_CHECKS, len(TARGETS)))
     
-    for i in range(1, NUM_CHECKS + 1):
-        start_time = time.time()
-        print(f"\n--- RUN {i}/{NUM_CHECKS} ---")
-        
-        for target in TARGETS:
-            monitor_page(session, target) # Monitor both targets
+    # Events already alerted recently (by this or an earlier run) are not e-mailed again
+    seen_events = load_seen_events()
+    
+    # Pages left unchanged since the previous run are answered by a 304 or the digest check
+    load_page_state()
+    
+    # The run covers the same window as num_checks cycles at the base interval; how many checks
+    # actually fit in it depends on the adaptive interval
+    run_window = num_checks * sleep_interval
+    
+    print(f"--- Starting PRODUCTION MONITORING RUN: {run_window}-second window with a {sleep_interval}-second base interval. ---")
+    
+    try:
+        # Cycles are scheduled against absolute deadlines on the monotonic clock, so the cadence
+        # neither drifts with check duration nor jumps when the wall clock is adjusted
+        next_start = time.monotonic()
+        run_deadline = next_start + run_window
+        poll_interval = sleep_interval
+        recent_durations = deque(maxlen=3)
+        consecutive_failures = 0
+        detected_targets = set()
+        i = 0
+        while True:
+            i += 1
+            start_time = time.monotonic()
+            print(f"\n--- RUN {i} ---")
+            
+            # Alerts that failed since the last cycle are retried by re-scanning their pages
+            forget_failed_alerts(seen_events)
+            
+            # Monitor both targets concurrently and wait for the whole cycle to finish
+            results = list(executor.map(lambda target: monitor_page(session, target), TARGETS))
+            consecutive_failures = consecutive_failures + 1 if all(r is None for r in results) else 0
+            
+            now = time.time()
+            hits = []
+            for target, found_terms in zip(TARGETS, results):
+                new_terms = [item for item in found_terms or [] if is_new_event(seen_events, target, item, now)]
+                if new_terms:
+                    hits.append((target, new_terms))
+            
+            # At most one email (and one SMTP round trip) per cycle, whatever the number of matches;
+            # it is sent in the background while the next cycle proceeds
+            if hits:
+                dispatch_cycle_alert(seen_events, hits, now)
+            
+            # Once every target has raised a new alert in this run, free the runner and let the next
+            # scheduled run pick up anything further; events suppressed by de-duplication do not count,
+            # as pages such as Finished keep listing old events on every check
+            detected_targets.update(target['_url'] for target, new_terms in hits)
+            if len(detected_targets) == len(TARGETS):
+                print("CYCLE INFO: All targets have raised new alerts. Ending the run early.")
+                break
 
-        end_time = time.time()
-        check_duration = end_time - start_time
-        
-        time_to_sleep = SLEEP_INTERVAL - check_duration
-        
-        if time_to_sleep > 0 and i < NUM_CHECKS:
-            print(f"CYCLE INFO: Sleeping for {time_to_sleep:.2f} seconds...")
-            time.sleep(time_to_sleep)
-        elif i < NUM_CHECKS:
-             print(f"CYCLE INFO: Check took {check_duration:.2f}s. No need to sleep.")
+            end_time = time.monotonic()
+            check_duration = end_time - start_time
+            recent_durations.append(check_duration)
+            
+            # Poll quickly while new events are appearing, and progressively less often while the pages
+            # are quiet; events already alerted (Finished keeps listing them) do not count as activity
+            if hits:
+                poll_interval = MIN_POLL_INTERVAL
+            else:
+                poll_interval = min(MAX_POLL_INTERVAL, poll_interval * IDLE_BACKOFF_FACTOR)
+            
+            interval = next_poll_interval(poll_interval, recent_durations, consecutive_failures)
+            interval *= random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+            # Clamp after the jitter, so it cannot push the gap outside the configured bounds
+            interval = min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, interval))
+            next_start += interval
+            
+            if next_start >= run_deadline:
+                break
+            
+            time_to_sleep = next_start - end_time
+            if time_to_sleep > 0:
+                print(f"CYCLE INFO: Sleeping for {time_to_sleep:.2f} seconds (interval {interval:.1f}s)...")
+                time.sleep(time_to_sleep)
+            else:
+                 print(f"CYCLE INFO: Check took {check_duration:.2f}s. No need to sleep.")
+                 # Overran the slot: restart the schedule from now rather than bursting to catch up
+                 next_start = end_time
+    finally:
+        # Deliver any queued alerts, then release the workers and pooled keep-alive connections;
+        # page state is saved after the flush, so a failed alert leaves its pages to be re-scanned
+        flush_email_alerts()
+        forget_failed_alerts(seen_events)
+        save_page_state()
+        executor.shutdown(wait=True)
+        session.close()
 
-    print(f"--- PRODUCTION MONITORING RUN COMPLETED. ---")
+    print(f"--- PRODUCTION MONITORING RUN COMPLETED ({i} checks). ---")
 
 
 if __name__ == "__main__":